@@ -1,17 +1,40 @@
+import hashlib
 import json
 import logging
-from bs4 import BeautifulSoup
+import os
+import sqlite3
+from bs4 import BeautifulSoup, ParserRejectedMarkup, SoupStrainer, Tag
+from bs4.builder import builder_registry
 from selenium import webdriver
-from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 import re
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterator, List, Optional, Union
 from dataclasses import dataclass, asdict
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin, urlparse, urlsplit
 import time
+import asyncio
+import queue
+import threading
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime
+from functools import lru_cache
+
+try:
+    import ahocorasick
+except ImportError:  # Optional C extension, purposes are matched with regexes instead
+    ahocorasick = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # Optional C parser, crawled pages are indexed with BeautifulSoup instead
+    LexborHTMLParser = None
+
+try:
+    import uvloop
+except ImportError:  # Not available on Windows, the crawler runs on the default event loop
+    uvloop = None
 
 # Configure logging
 logging.basicConfig(
@@ -20,7 +43,152 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Fallback lifetime for cached responses that carry no Cache-Control headers
+HTTP_CACHE_EXPIRE_SECONDS = 600
+CHROME_DISK_CACHE_BYTES = 100 * 1024 * 1024
+# Sub-resources the parser never looks at, blocked in the browser to save bandwidth
+BLOCKED_RESOURCE_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.css', '*.woff', '*.woff2', '*.ttf', '*.otf',
+    '*.mp4', '*.webm', '*.mp3'
+]
+
+# hrefs that urljoin would normalise (whitespace, empty query or fragment,
+# dot segments, empty authority) must not take the string-concatenation path
+_NEEDS_URLJOIN_RE = re.compile(r'[\x00-\x20]|[?#]$|\?#|(?:^|/)\.\.?(?:[/?#;]|$)|^(?:https?:)?//(?:[/?#]|$)')
+# Links to these files are not crawled, with or without a query or fragment
+_SKIP_EXTENSION_RE = re.compile(r'\.(?:pdf|jpe?g|png|gif|zip)(?:[?#]|\Z)', re.I)
+# Seconds a resolved host is reused by the crawler before looking it up again
+CRAWL_DNS_CACHE_SECONDS = 300
+# Relative hrefs repeat heavily across the pages of a site, kept across pages
+_urljoin = lru_cache(maxsize=16384)(urljoin)
+
+_HEADING_TAGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+
+
+class _TopLevelStrainer(SoupStrainer):
+    """SoupStrainer that also keeps any top-level tag declaring microdata.
+
+    Pages often put the page-wide item on <html itemscope> and some of its
+    properties on <link itemprop> tags in <head>; a plain name filter drops both.
+    """
+
+    @staticmethod
+    def _has_microdata(attrs) -> bool:
+        return bool(attrs) and ('itemscope' in attrs or 'itemprop' in attrs)
+
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        # Consulted while the tree is built by BeautifulSoup before 4.13
+        if isinstance(markup_name, str) and self._has_microdata(markup_attrs):
+            return markup_name
+        return super().search_tag(markup_name, markup_attrs)
+
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        # Consulted while the tree is built by BeautifulSoup 4.13 and later
+        return self._has_microdata(attrs) or super().allow_tag_creation(nsprefix, name, attrs)
+
+
+# Top-level tags worth building a tree for. The strainer only filters the
+# children of the document root: <body> is kept whole, while <head> is reduced
+# to the title, Open Graph meta tags and JSON-LD scripts that the parser reads,
+# plus tags carrying microdata. A kept <html itemscope> keeps the whole document.
+_STRAINER = _TopLevelStrainer(['title', 'meta', 'script', 'body'])
+# Fastest installed tree builder, resolved once instead of failing over on every page
+_PARSER = next(
+    (feature for feature in ('lxml', 'html5lib', 'html.parser') if builder_registry.lookup(feature)),
+    'html.parser'
+)
+# Interactive selectors, in the order their matches are reported
+_INTERACTIVE_SELECTORS = (
+    'button', 'input', 'a', 'select',
+    '[role="button"]', '[role="link"]',
+    '[role="menuitem"]', 'form'
+)
+_INTERACTIVE_TAGS = ('button', 'input', 'a', 'select')
+_INTERACTIVE_ROLES = ('button', 'link', 'menuitem')
+# Keys of an element's context, in the order they are reported
+CONTEXT_FIELDS = ('section_heading', 'form_name', 'in_navigation', 'in_list', 'url')
+
+# Purpose keywords are checked in order, the first entry with a match wins
+_ACTION_KEYWORDS = {
+    'submit': ('submit', 'send', 'save', 'confirm', 'ok', 'apply'),
+    'search': ('search', 'find', 'lookup'),
+    'navigate': ('menu', 'nav', 'go to', 'link'),
+    'delete': ('delete', 'remove', 'clear'),
+    'edit': ('edit', 'modify', 'change', 'update'),
+    'form': ('form', 'input', 'enter'),
+    'login': ('login', 'sign in', 'signin'),
+    'register': ('register', 'sign up', 'signup'),
+    'download': ('download', 'export', 'get'),
+    'upload': ('upload', 'import', 'attach')
+}
+_SECTION_KEYWORDS = {
+    'header': ('header', 'banner', 'top'),
+    'footer': ('footer', 'bottom'),
+    'sidebar': ('sidebar', 'aside'),
+    'main': ('main', 'content', 'article'),
+    'navigation': ('nav', 'menu'),
+    'search': ('search',),
+    'login': ('login', 'signin'),
+    'form': ('form', 'contact')
+}
+
+
+def _compile_keyword_patterns(keyword_table: Dict[str, tuple]):
+    """Compile one pattern per table entry, plus a named-group union that finds the leftmost keyword of any entry.
+
+    Keywords are lowercase and the patterns are case-sensitive, signals are lowercased before matching.
+    """
+    patterns = [
+        (name, re.compile('|'.join(map(re.escape, keywords))))
+        for name, keywords in keyword_table.items()
+    ]
+    union = re.compile('|'.join(f'(?P<{name}>{pattern.pattern})' for name, pattern in patterns))
+    return patterns, union
+
+
+def _first_keyword_match(signal: str, patterns, union) -> Optional[str]:
+    """Return the first table entry, in order, with a keyword in the lowercased signal."""
+    match = union.search(signal)
+    if not match:
+        return None
+    # The leftmost keyword may belong to a lower-priority entry,
+    # so only the entries listed before it need a second look
+    name = match.lastgroup
+    for earlier_name, pattern in patterns:
+        if earlier_name == name:
+            break
+        if pattern.search(signal):
+            return earlier_name
+    return name
+
+
+def _build_keyword_automaton(keyword_table: Dict[str, tuple]):
+    """Compile a keyword table into an Aho-Corasick automaton mapping each keyword to its entry's index."""
+    automaton = ahocorasick.Automaton()
+    for index, keywords in enumerate(keyword_table.values()):
+        for keyword in keywords:
+            if keyword not in automaton:
+                automaton.add_word(keyword, index)
+    automaton.make_automaton()
+    return automaton
+
+
+def _first_automaton_match(signal: str, names: List[str], automaton) -> Optional[str]:
+    """Return the first table entry, in order, with a keyword in the lowercased signal, using one automaton scan."""
+    # One scan reports every keyword occurrence
+    index = min((index for _, index in automaton.iter(signal)), default=None)
+    return names[index] if index is not None else None
+
+
+_ACTIONS = list(_ACTION_KEYWORDS)
+_ACTION_PATTERNS, _ACTION_RE = _compile_keyword_patterns(_ACTION_KEYWORDS)
+_ACTION_AUTOMATON = _build_keyword_automaton(_ACTION_KEYWORDS) if ahocorasick else None
+_SECTIONS = list(_SECTION_KEYWORDS)
+_SECTION_PATTERNS, _SECTION_RE = _compile_keyword_patterns(_SECTION_KEYWORDS)
+_SECTION_AUTOMATON = _build_keyword_automaton(_SECTION_KEYWORDS) if ahocorasick else None
+
+@dataclass(slots=True, frozen=True)
 class ElementSemantics:
     element_type: str
     purpose: str
@@ -28,7 +196,7 @@ class ElementSemantics:
     aria_labels: Dict
     is_actionable: bool = True
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PageSection:
     heading: Optional[str]
     purpose: str
@@ -38,11 +206,55 @@ class PageSection:
     def to_dict(self):
         return asdict(self)
 
+@dataclass(slots=True, frozen=True)
+class StoredPage:
+    etag: Optional[str]
+    last_modified: Optional[str]
+    body_digest: bytes
+    parsed: Dict
+
+class PageStore:
+    """Crawl index entries kept across runs in SQLite, with the validators needed for conditional requests."""
+
+    def __init__(self, path: str):
+        self._connection = sqlite3.connect(path)
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS pages ('
+            'url_hash BLOB PRIMARY KEY, etag TEXT, last_modified TEXT, body_digest BLOB, parsed TEXT)'
+        )
+
+    @staticmethod
+    def _key(url: str) -> bytes:
+        # Fixed-size keys keep the index compact however long the URLs get
+        return hashlib.blake2b(url.encode(), digest_size=16).digest()
+
+    def get(self, url: str) -> Optional[StoredPage]:
+        row = self._connection.execute(
+            'SELECT etag, last_modified, body_digest, parsed FROM pages WHERE url_hash = ?', (self._key(url),)
+        ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, body_digest, parsed = row
+        return StoredPage(etag, last_modified, body_digest, json.loads(parsed))
+
+    def put(self, url: str, page: StoredPage):
+        with self._connection:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?)',
+                (self._key(url), page.etag, page.last_modified, page.body_digest, json.dumps(page.parsed))
+            )
+
+    def close(self):
+        self._connection.close()
+
 class WebpageSemanticParser:
-    def __init__(self, use_selenium: bool = True, timeout: int = 30):
+    def __init__(self, use_selenium: bool = True, timeout: int = 30, cache_dir: Optional[str] = '.wsp_cache',
+                 block_resources: bool = True, request_delay: float = 1.0):
         self.use_selenium = use_selenium
         self.driver = None
         self.timeout = timeout
+        self.cache_dir = cache_dir  # None disables HTTP and browser caching
+        self._http_session = None
         if use_selenium:
             # Initialize headless Chrome driver
             logger.info("Initializing headless Chrome driver")
@@ -51,14 +263,31 @@ class WebpageSemanticParser:
             options.add_argument('--disable-gpu')
             options.add_argument('--no-sandbox')
             options.add_argument('--disable-dev-shm-usage')
+            # Return from get() once the DOM is ready instead of after every sub-resource
+            options.page_load_strategy = 'eager'
+            if cache_dir:
+                # Keep sub-resources cached across driver sessions and runs
+                options.add_argument(f'--disk-cache-dir={os.path.abspath(os.path.join(cache_dir, "chrome"))}')
+                options.add_argument(f'--disk-cache-size={CHROME_DISK_CACHE_BYTES}')
+            if block_resources:
+                # Only the DOM is parsed, so don't spend time rendering media
+                options.add_argument('--blink-settings=imagesEnabled=false')
+                options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
             # Add page load timeout
             self.driver = webdriver.Chrome(options=options)
             self.driver.set_page_load_timeout(self.timeout)
+            if block_resources:
+                # Stylesheets, fonts and media are dropped before any request is sent
+                self.driver.execute_cdp_cmd('Network.enable', {})
+                self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_RESOURCE_PATTERNS})
         
-        self.actionable_elements = {}
+        self.actionable_elements: List[ElementSemantics] = []
         self.semantic_structure = {}
+        self._reset_page_state()
         self.last_request_time = defaultdict(float)
-        self.request_delay = 1.0  # Minimum seconds between requests to same domain
+        self.request_delay = request_delay  # Minimum seconds between requests to same domain
+        self.context_fields = CONTEXT_FIELDS  # Context reported for each actionable element
+        self._rate_lock = threading.Lock()  # Shared with other parsers fetching concurrently
         self.stats = {
             'pages_visited': 0,
             'start_time': None,
@@ -70,22 +299,53 @@ class WebpageSemanticParser:
             logger.info("Closing Chrome driver")
             self.driver.quit()
 
+    def _get_http_session(self):
+        """Get the HTTP session for static pages, caching responses if enabled"""
+        if self._http_session is None:
+            if self.cache_dir:
+                import requests_cache
+                os.makedirs(self.cache_dir, exist_ok=True)
+                self._http_session = requests_cache.CachedSession(
+                    os.path.join(self.cache_dir, 'http'),
+                    expire_after=HTTP_CACHE_EXPIRE_SECONDS,
+                    cache_control=True
+                )
+            else:
+                import requests
+                self._http_session = requests.Session()
+        return self._http_session
+
+    def _reserve_request_slot(self, url: str) -> float:
+        """Reserve the next free request slot for the URL's domain, returning the seconds until it starts"""
+        domain = urlparse(url).netloc
+        # Only the reservation is locked, callers wait for their slot outside the lock
+        with self._rate_lock:
+            now = time.time()
+            start = max(now, self.last_request_time[domain] + self.request_delay)
+            self.last_request_time[domain] = start
+        return start - now
+
     def _respect_rate_limits(self, url: str):
         """Implement rate limiting per domain"""
-        domain = urlparse(url).netloc
-        elapsed = time.time() - self.last_request_time[domain]
-        if elapsed < self.request_delay:
-            time.sleep(self.request_delay - elapsed)
-        self.last_request_time[domain] = time.time()
+        delay = self._reserve_request_slot(url)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def _async_respect_rate_limits(self, url: str):
+        """Per-domain rate limiting for the async crawler, shares slots with the blocking fetches"""
+        delay = self._reserve_request_slot(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
 
-    def extract_all_links(self, soup) -> List[Dict]:
+    def extract_all_links(self, soup=None) -> List[Dict]:
         """Extract all links from the page"""
         links = []
-        for a in soup.find_all('a', href=True):
+        anchors = self._links if soup is None or soup is self.soup else soup.find_all('a', href=True)
+        for a in anchors:
             href = a['href']
-            absolute_url = urljoin(self.base_url, href)
+            absolute_url = self._resolve(href)
             links.append({
-                'text': a.get_text(strip=True),
+                'text': self._text(a),
                 'href': absolute_url
             })
         return links
@@ -98,61 +358,72 @@ class WebpageSemanticParser:
         }
         
         # Extract JSON-LD
-        for script in self.soup.find_all('script', type='application/ld+json'):
+        for script in self._json_ld_scripts:
             try:
                 data = json.loads(script.string)
                 structured_data['json_ld'].append(data)
-                logger.debug("Extracted JSON-LD data")
             except json.JSONDecodeError:
                 logger.warning("Failed to decode JSON-LD script")
         
         # Extract Open Graph data
-        for meta in self.soup.find_all('meta'):
+        for meta in self._meta_tags:
             if meta.get('property', '').startswith('og:'):
                 prop = meta.get('property')[3:]
                 content = meta.get('content', '')
                 structured_data['open_graph'][prop] = content
-                logger.debug(f"Extracted Open Graph property: og:{prop}")
         
         # Extract Microdata
-        for item in self.soup.find_all(attrs={'itemscope': True}):
+        for item in self._microdata_items:
             item_type = item.get('itemtype', 'Unknown')
             item_properties = {}
-            for prop in item.find_all(attrs={'itemprop': True}):
+            for prop in self._item_props[id(item)]:
                 prop_name = prop.get('itemprop')
-                prop_value = prop.get('content') or prop.get_text(strip=True)
+                prop_value = prop.get('content') or self._text(prop)
                 item_properties[prop_name] = prop_value
             structured_data['microdata'].append({
                 'type': item_type,
                 'properties': item_properties
             })
-            logger.debug(f"Extracted Microdata type: {item_type}")
         
         return structured_data
 
     def parse_webpage(self, url: str) -> Dict:
         """Main parsing function to analyze webpage content and structure."""
+        logger.info("Starting to parse webpage: %s", url)
+        return self.parse_html(self._fetch_page_source(url), url)
+
+    def _fetch_page_source(self, url: str) -> str:
+        """Fetch the page HTML with the browser or a plain HTTP request."""
         self._respect_rate_limits(url)
-        logger.info(f"Starting to parse webpage: {url}")
         if self.use_selenium:
             logger.debug("Using Selenium to fetch page content")
             self.driver.get(url)
-            # Wait for dynamic content to load
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
+            # The eager load strategy returns at DOMContentLoaded, this only guards against early returns
+            WebDriverWait(self.driver, 2).until(
+                lambda driver: driver.execute_script("return document.readyState") != "loading"
             )
             page_source = self.driver.page_source
         else:
             # For static pages, use simple HTTP request
             logger.debug("Using requests to fetch static page content")
-            import requests
-            page_source = requests.get(url).text
+            page_source = self._get_http_session().get(url).text
+        return page_source
 
-        self.soup = BeautifulSoup(page_source, 'html.parser')
+    def parse_html(self, page_source: str, url: str) -> Dict:
+        """Analyze already fetched page source as the page at url."""
+        try:
+            self.soup = BeautifulSoup(page_source, _PARSER, parse_only=_STRAINER)
+        except ParserRejectedMarkup as e:
+            # The parser choked on malformed markup, use the lenient one
+            logger.warning("%s could not parse %s, falling back to html5lib: %s", _PARSER, url, e)
+            self.soup = BeautifulSoup(page_source, 'html5lib')
         self.base_url = url
+        self._base_parts = urlsplit(url)
         
+        self._collect(self.soup)
+
         # Extract all links
-        all_links = self.extract_all_links(self.soup)
+        all_links = self.extract_all_links()
         
         # Extract structured data
         structured_data = self.extract_structured_data()
@@ -162,36 +433,292 @@ class WebpageSemanticParser:
         logger.info("Building semantic hierarchy")
         self.build_semantic_hierarchy()
         
-        return {
+        result = {
             'actions': self.get_available_actions(),
             'structure': self.semantic_structure,
             'possible_tasks': self.identify_possible_tasks(),
             'all_links': all_links,
             'structured_data': structured_data  # Add structured data to the output
         }
+        # The result holds plain values only, free the tree and everything
+        # pointing into it before the next page is parsed
+        self.soup.decompose()
+        self.soup = None
+        self.actionable_elements.clear()
+        self.semantic_structure = {}
+        self._reset_page_state()
+        return result
+
+    def parse_index(self, page_source: str, url: str) -> Dict:
+        """Extract the title and link URLs of a page, all that the traversal index needs."""
+        if LexborHTMLParser is None:
+            page_data = self.parse_html(page_source, url)
+            return {
+                'title': page_data['structure'].get('title'),
+                'links': [link['href'] for link in page_data['all_links']]
+            }
+
+        self.base_url = url
+        self._base_parts = urlsplit(url)
+        tree = LexborHTMLParser(page_source)
+        title = tree.css_first('title')
+        return {
+            # Like Tag.string, an empty title has no text
+            'title': (title.text() or None) if title is not None else None,
+            # A bare href attribute has no value in selectolax, BeautifulSoup reads it as ''
+            'links': [self._resolve(a.attributes.get('href') or '') for a in tree.css('a[href]')]
+        }
+
+    @staticmethod
+    def _walk(root):
+        """Yield (tag, entering) events for every tag below root, in document order."""
+        stack = [(root, iter(root.contents))]
+        while stack:
+            tag, children = stack[-1]
+            for child in children:
+                if isinstance(child, Tag):
+                    yield child, True
+                    stack.append((child, iter(child.contents)))
+                    break
+            else:
+                stack.pop()
+                if stack:
+                    yield tag, False
+
+    def _resolve(self, href: str) -> str:
+        """Resolve href against the page URL, skipping urljoin's parsing for common forms."""
+        if not href:
+            return self.base_url
+        if not _NEEDS_URLJOIN_RE.search(href):
+            if href.startswith(('http://', 'https://')):
+                return href
+            if href.startswith('//'):
+                return f"{self._base_parts.scheme}:{href}"
+            if href.startswith('/'):
+                return f"{self._base_parts.scheme}://{self._base_parts.netloc}{href}"
+        return _urljoin(self.base_url, href)
+
+    def _reset_page_state(self):
+        """Drop the buckets, indexes and caches that refer to the current page's tree."""
+        self._headings = []
+        self._sections = []
+        self._text_blocks = []
+        self._forms = []
+        self._navs = []
+        self._links = []
+        # Every anchor and image in document order, sections own a contiguous span of each
+        self._anchors = []
+        self._images = []
+        self._interactive = {selector: [] for selector in _INTERACTIVE_SELECTORS}
+        # Stripped text per tag id, elements are stringified from several places
+        self._text_cache = {}
+        # Preceding heading plus form, navigation and list ancestry of each interactive element
+        self._ancestry = {}
+        # Lookups for parse_forms, parse_navigation and find_input_label
+        self._form_fields = {}
+        self._nav_links = {}
+        self._nav_locations = {}
+        self._labels_by_for = {}
+        self._parent_labels = {}
+        # Parsed form dicts per form id, a form is reported again by every section containing it
+        self._parsed_forms = {}
+        # Structured data sources, microdata properties per itemscope id
+        self._json_ld_scripts = []
+        self._meta_tags = []
+        self._microdata_items = []
+        self._item_props = {}
+        # Preceding heading of each section and whether it contains a link or input
+        self._section_context = {}
+        # Slices of _anchors, _images and _forms holding each section's descendants
+        self._section_spans = {}
+
+    def _collect(self, root):
+        """Walk the document once, sorting elements into the buckets the parser reports on."""
+        self._reset_page_state()
+
+        body = root.body
+        in_body = False
+        # Most recent heading in document order, inherited by everything after it
+        current_heading = None
+        form_stack = []
+        label_stack = []
+        nav_stack = []
+        item_stack = []
+        # Heading, link/input count and bucket sizes when each open section was entered
+        open_sections = {}
+        links_and_inputs = 0
+        list_depth = 0
+        header_depth = 0
+        footer_depth = 0
+        for element, entering in self._walk(root):
+            name = element.name
+            role = element.get('role')
+            is_navigation = name == 'nav' or role == 'navigation'
+            if not entering:
+                if name == 'form':
+                    form_stack.pop()
+                elif name == 'label':
+                    label_stack.pop()
+                elif name in ('ul', 'ol'):
+                    list_depth -= 1
+                elif name == 'header':
+                    header_depth -= 1
+                elif name == 'footer':
+                    footer_depth -= 1
+                if is_navigation:
+                    nav_stack.pop()
+                if element is body:
+                    in_body = False
+                if item_stack and item_stack[-1] is element:
+                    item_stack.pop()
+                if name in ('div', 'p', 'table') and id(element) in open_sections:
+                    heading, entered_count, anchors_start, images_start, forms_start = open_sections.pop(id(element))
+                    self._section_context[id(element)] = (heading, links_and_inputs > entered_count)
+                    self._section_spans[id(element)] = (
+                        slice(anchors_start, len(self._anchors)),
+                        slice(images_start, len(self._images)),
+                        slice(forms_start, len(self._forms))
+                    )
+                continue
+
+            if name in _HEADING_TAGS:
+                current_heading = element
+            elif name in ('a', 'input'):
+                links_and_inputs += 1
+
+            # Each element is reported under the first selector it matches
+            selector = None
+            if name in _INTERACTIVE_TAGS:
+                selector = name
+            elif role in _INTERACTIVE_ROLES:
+                selector = f'[role="{role}"]'
+            elif name == 'form':
+                selector = 'form'
+            if selector:
+                self._interactive[selector].append(element)
+                self._ancestry[id(element)] = (
+                    current_heading,
+                    form_stack[-1] if form_stack else None,
+                    bool(nav_stack),
+                    list_depth > 0
+                )
+
+            if name in ('input', 'select', 'textarea'):
+                # Fields of nested forms also belong to the enclosing forms
+                for form in form_stack:
+                    self._form_fields[id(form)].append(element)
+                if label_stack:
+                    self._parent_labels[id(element)] = label_stack[-1]
+            elif name == 'a':
+                self._anchors.append(element)
+                if element.get('href') is not None:
+                    self._links.append(element)
+                # Links of nested navigation also belong to the enclosing ones
+                for nav in nav_stack:
+                    self._nav_links[id(nav)].append(element)
+
+            if name == 'form':
+                self._forms.append(element)
+                self._form_fields[id(element)] = []
+                form_stack.append(element)
+            elif name == 'label':
+                label_for = element.get('for')
+                if label_for is not None:
+                    self._labels_by_for.setdefault(label_for, element)
+                label_stack.append(element)
+            elif name in ('ul', 'ol'):
+                list_depth += 1
+            elif name == 'img':
+                self._images.append(element)
+            # Covers both <nav> and ARIA navigation landmarks
+            if is_navigation:
+                self._navs.append(element)
+                self._nav_links[id(element)] = []
+                self._nav_locations[id(element)] = (
+                    'header' if header_depth else 'footer' if footer_depth else 'other'
+                )
+                nav_stack.append(element)
+            # Only counted after the navigation check, a landmark is not inside itself
+            if name == 'header':
+                header_depth += 1
+            elif name == 'footer':
+                footer_depth += 1
+            if element is body:
+                in_body = True
+
+            if name == 'meta':
+                self._meta_tags.append(element)
+            elif name == 'script' and element.get('type') == 'application/ld+json':
+                self._json_ld_scripts.append(element)
+            if element.get('itemprop') is not None:
+                # Properties of nested items also belong to the enclosing items
+                for item in item_stack:
+                    self._item_props[id(item)].append(element)
+            if element.get('itemscope') is not None:
+                self._microdata_items.append(element)
+                self._item_props[id(element)] = []
+                item_stack.append(element)
+
+            if in_body:
+                if name in _HEADING_TAGS:
+                    self._headings.append(element)
+                if name in ('div', 'p', 'table'):
+                    self._sections.append(element)
+                    open_sections[id(element)] = (
+                        current_heading, links_and_inputs, len(self._anchors), len(self._images), len(self._forms)
+                    )
+                if name in ('p', 'div', 'span'):
+                    self._text_blocks.append(element)
+
+    def _text(self, tag) -> str:
+        """Return tag.get_text(strip=True), computed once per tag."""
+        text = self._text_cache.get(id(tag))
+        if text is None:
+            text = tag.get_text(strip=True)
+            self._text_cache[id(tag)] = text
+        return text
+
+    def _text_prefix(self, tag, limit: int) -> str:
+        """Return the first `limit` characters of the tag's stripped text without joining all of it."""
+        text = self._text_cache.get(id(tag))
+        if text is not None:
+            return text[:limit]
+        parts = []
+        length = 0
+        for string in tag.stripped_strings:
+            parts.append(string)
+            length += len(string)
+            if length >= limit:
+                break
+        return ''.join(parts)[:limit]
 
     def identify_interactive_elements(self):
         """Identify all interactive elements on the page."""
         logger.debug("Searching for interactive elements")
-        # Find all potentially interactive elements
-        selectors = [
-            'button', 'input', 'a', 'select', 
-            '[role="button"]', '[role="link"]', 
-            '[role="menuitem"]', 'form'
-        ]
-        
-        for selector in selectors:
-            elements = self.soup.select(selector)
-            logger.debug(f"Found {len(elements)} elements matching selector: {selector}")
+        for selector, elements in self._interactive.items():
+            logger.debug("Found %s elements matching selector: %s", len(elements), selector)
             for element in elements:
+                # Skip the purpose and context analysis for elements nobody can act on
+                if not self._quick_actionable(element):
+                    continue
                 semantics = self.analyze_element(element)
                 if semantics.is_actionable:
-                    self.actionable_elements[element] = semantics
+                    self.actionable_elements.append(semantics)
+
+    @staticmethod
+    def _quick_actionable(element) -> bool:
+        """Cheap check that rules out hidden and disabled elements."""
+        if element.get('aria-hidden') == 'true':
+            return False
+        if element.name == 'input' and element.get('type') == 'hidden':
+            return False
+        if element.has_attr('disabled'):
+            return False
+        return True
 
     def analyze_element(self, element) -> ElementSemantics:
         """Analyze individual element for semantic meaning."""
         element_type = element.name or element.get('role', 'unknown')
-        logger.debug(f"Analyzing element of type: {element_type}")
         
         # Gather accessibility information
         aria_labels = {
@@ -202,7 +729,7 @@ class WebpageSemanticParser:
         }
         
         # Get context and purpose
-        context = self.get_element_context(element)
+        context = self.get_element_context(element, self.context_fields)
         purpose = self.infer_purpose(element)
         
         return ElementSemantics(
@@ -216,7 +743,7 @@ class WebpageSemanticParser:
         """Infer the purpose of an element based on various signals."""
         # Get all potential signals
         signals = [
-            element.get_text(strip=True),
+            self._text(element),
             element.get('aria-label'),
             element.get('title'),
             element.get('placeholder'),
@@ -232,55 +759,54 @@ class WebpageSemanticParser:
         # Filter out None values
         signals = [str(s) for s in signals if s]
         
-        action_patterns = {
-            'submit': r'submit|send|save|confirm|ok|apply',
-            'search': r'search|find|lookup',
-            'navigate': r'menu|nav|go to|link',
-            'delete': r'delete|remove|clear',
-            'edit': r'edit|modify|change|update',
-            'form': r'form|input|enter',
-            'login': r'login|sign in|signin',
-            'register': r'register|sign up|signup',
-            'download': r'download|export|get',
-            'upload': r'upload|import|attach'
-        }
-        
         for signal in signals:
-            for action, pattern in action_patterns.items():
-                if re.search(pattern, signal, re.I):
-                    logger.debug(f"Inferred purpose '{action}' from signal: {signal}")
-                    return action
+            action = self._match_action(signal)
+            if action:
+                return action
         
-        logger.debug("Could not infer specific purpose for element")
         return 'unknown'
 
-    def get_element_context(self, element) -> Dict:
-        """Get contextual information about where element appears in page."""
-        # Find nearest heading
-        heading = None
-        for parent in element.parents:
-            heading_tag = parent.find(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
-            if heading_tag:
-                heading = heading_tag.get_text(strip=True)
-                break
+    @staticmethod
+    def _match_action(signal: str) -> Optional[str]:
+        """Return the first action, in table order, with a keyword in the signal."""
+        # Lowercased once here instead of case-folding inside every match
+        signal = signal.lower()
+        if _ACTION_AUTOMATON is not None:
+            return _first_automaton_match(signal, _ACTIONS, _ACTION_AUTOMATON)
+        return _first_keyword_match(signal, _ACTION_PATTERNS, _ACTION_RE)
 
-        # Find parent form and get its name if it exists
-        parent_form = element.find_parent('form')
-        form_name = parent_form.get('name') if parent_form else None
+    @staticmethod
+    def _match_section(signal: str) -> Optional[str]:
+        """Return the first section purpose, in table order, with a keyword in the signal."""
+        signal = signal.lower()
+        if _SECTION_AUTOMATON is not None:
+            return _first_automaton_match(signal, _SECTIONS, _SECTION_AUTOMATON)
+        return _first_keyword_match(signal, _SECTION_PATTERNS, _SECTION_RE)
 
-        return {
-            'section_heading': heading,
-            'form_name': form_name,
-            'in_navigation': bool(element.find_parent('nav')),
-            'in_list': bool(element.find_parent(['ul', 'ol'])),
-            'url': urljoin(self.base_url, element.get('href', '')) if element.name == 'a' else None
-        }
+    def get_element_context(self, element, fields=CONTEXT_FIELDS) -> Dict:
+        """Get contextual information about where element appears in page, only computing the given fields."""
+        # Heading and ancestry were recorded while walking the page
+        heading, parent_form, in_navigation, in_list = self._ancestry[id(element)]
+        context = {}
+        if 'section_heading' in fields:
+            context['section_heading'] = self._text(heading) if heading else None
+        if 'form_name' in fields:
+            context['form_name'] = parent_form.get('name') if parent_form else None
+        if 'in_navigation' in fields:
+            context['in_navigation'] = in_navigation
+        if 'in_list' in fields:
+            context['in_list'] = in_list
+        if 'url' in fields:
+            context['url'] = self._resolve(element.get('href', '')) if element.name == 'a' else None
+        return context
 
     def build_semantic_hierarchy(self):
         """Build hierarchical structure of page content."""
         logger.info("Building semantic hierarchy of page content")
+        title = self.soup.title.string if self.soup.title else None
         self.semantic_structure = {
-            'title': self.soup.title.string if self.soup.title else None,
+            # A plain str, the NavigableString would keep the tree reachable
+            'title': str(title) if title is not None else None,
             'main_content': self.parse_main_content(),
             'navigation': self.parse_navigation(),
             'forms': self.parse_forms()
@@ -289,54 +815,45 @@ class WebpageSemanticParser:
     def parse_main_content(self) -> Dict:
         """Parse main content area of the page."""
         logger.debug("Parsing main content area")
-        # Look for any content, not just semantic elements
-        main = self.soup.find('body')
-        
         # Extract text content directly if no semantic structure exists
         text_content = ' '.join([
-            p.get_text(strip=True) 
-            for p in main.find_all(['p', 'div', 'span'])
-            if p.get_text(strip=True)
+            self._text(p) 
+            for p in self._text_blocks
+            if self._text(p)
         ])
         
         return {
-            'headings': self.extract_heading_hierarchy(main),
-            'sections': self.extract_sections(main),
+            'headings': list(self.extract_heading_hierarchy()),
+            'sections': self.extract_sections(),
             'text_content': text_content  # Add raw text content
         }
 
-    def extract_heading_hierarchy(self, container) -> List[Dict]:
-        """Extract hierarchical heading structure."""
-        headings = container.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
-        logger.debug(f"Found {len(headings)} headings")
-        hierarchy = []
-        
-        for heading in headings:
+    def extract_heading_hierarchy(self) -> Iterator[Dict]:
+        """Yield the hierarchical heading structure in document order."""
+        logger.debug("Found %s headings", len(self._headings))
+        for heading in self._headings:
             level = int(heading.name[1])
-            hierarchy.append({
-                'text': heading.get_text(strip=True),
+            yield {
+                'text': self._text(heading),
                 'level': level,
                 'id': heading.get('id')
-            })
-            
-        return hierarchy
+            }
 
-    def extract_sections(self, container) -> List[Dict]:
+    def extract_sections(self) -> List[Dict]:
         """Extract content sections and their purposes."""
         sections = []
-        for section in container.find_all(['div', 'p', 'table']):
-            if section.get_text(strip=True):
-                heading = section.find_previous(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
-                has_interactive = bool(section.find(['a', 'input']))
+        for section in self._sections:
+            if self._text(section):
+                heading, has_interactive = self._section_context[id(section)]
                 
                 sections.append(PageSection(
-                    heading=heading.get_text(strip=True) if heading else None,
+                    heading=self._text(heading) if heading else None,
                     purpose=self.infer_section_purpose(section),
                     has_interactive_elements=has_interactive,
                     content=self.extract_section_content(section)
                 ).to_dict())
         
-        logger.debug(f"Extracted {len(sections)} content sections")
+        logger.debug("Extracted %s content sections", len(sections))
         return sections
 
     def infer_section_purpose(self, section) -> str:
@@ -345,88 +862,92 @@ class WebpageSemanticParser:
             section.get('class', []),
             section.get('id', ''),
             section.get('role', ''),
-            section.get_text(strip=True)[:100]  # First 100 chars of text
+            self._text_prefix(section, 100)  # First 100 chars of text
         ]
         
-        purpose_patterns = {
-            'header': r'header|banner|top',
-            'footer': r'footer|bottom',
-            'sidebar': r'sidebar|aside',
-            'main': r'main|content|article',
-            'navigation': r'nav|menu',
-            'search': r'search',
-            'login': r'login|signin',
-            'form': r'form|contact'
-        }
-        
         for signal in signals:
             if isinstance(signal, list):
                 signal = ' '.join(signal)
-            for purpose, pattern in purpose_patterns.items():
-                if re.search(pattern, str(signal), re.I):
-                    logger.debug(f"Inferred section purpose: {purpose}")
-                    return purpose
+            purpose = self._match_section(str(signal))
+            if purpose:
+                return purpose
                     
-        logger.debug("Could not infer specific section purpose")
         return 'unknown'
 
     def extract_section_content(self, section) -> Dict:
         """Extract the content structure of a section."""
+        spans = self._section_spans.get(id(section))
+        if spans:
+            # Sections found by the tree walk know where their descendants are
+            anchors, images = self._anchors[spans[0]], self._images[spans[1]]
+        else:
+            anchors, images = section.find_all('a'), section.find_all('img')
         return {
-            'text_content': section.get_text(strip=True),
-            'links': [{'text': a.get_text(strip=True), 
-                      'href': urljoin(self.base_url, a.get('href', ''))}
-                     for a in section.find_all('a')],
+            'text_content': self._text(section),
+            'links': [{'text': self._text(a), 
+                      'href': self._resolve(a.get('href', ''))}
+                     for a in anchors],
             'images': [{'alt': img.get('alt', ''),
-                       'src': urljoin(self.base_url, img.get('src', ''))}
-                      for img in section.find_all('img')],
+                       'src': self._resolve(img.get('src', ''))}
+                      for img in images],
             'forms': self.parse_forms(section)
         }
 
     def parse_navigation(self) -> List[Dict]:
         """Parse navigation elements of the page."""
-        nav_elements = self.soup.find_all(['nav', '[role="navigation"]'])
-        logger.debug(f"Found {len(nav_elements)} navigation elements")
+        logger.debug("Found %s navigation elements", len(self._navs))
         navigation = []
         
-        for nav in nav_elements:
+        for nav in self._navs:
             navigation.append({
-                'items': [{'text': a.get_text(strip=True),
-                          'url': urljoin(self.base_url, a.get('href', ''))}
-                         for a in nav.find_all('a')],
+                'items': [{'text': self._text(a),
+                          'url': self._resolve(a.get('href', ''))}
+                         for a in self._nav_links[id(nav)]],
                 'aria_label': nav.get('aria-label'),
-                'location': 'header' if nav.find_parent('header') else 'footer' if nav.find_parent('footer') else 'other'
+                'location': self._nav_locations[id(nav)]
             })
             
         return navigation
 
     def parse_forms(self, container=None) -> List[Dict]:
         """Parse forms and their input fields."""
+        if container is None:
+            form_tags = self._forms
+        elif id(container) in self._section_spans:
+            form_tags = self._forms[self._section_spans[id(container)][2]]
+        else:
+            form_tags = container.find_all('form')
         forms = []
-        for form in (container or self.soup).find_all('form'):
-            logger.debug(f"Parsing form: {form.get('name', 'unnamed')}")
-            form_data = {
-                'name': form.get('name'),
-                'id': form.get('id'),
-                'method': form.get('method', 'get'),
-                'action': urljoin(self.base_url, form.get('action', '')),
-                'inputs': []
-            }
-            
-            for input_field in form.find_all(['input', 'select', 'textarea']):
-                form_data['inputs'].append({
-                    'type': input_field.get('type', 'text'),
-                    'name': input_field.get('name'),
-                    'id': input_field.get('id'),
-                    'required': input_field.get('required') is not None,
-                    'placeholder': input_field.get('placeholder'),
-                    'label': self.find_input_label(input_field)
-                })
-                
+        for form in form_tags:
+            form_data = self._parsed_forms.get(id(form))
+            if form_data is None:
+                form_data = self._parsed_forms[id(form)] = self._parse_form(form)
             forms.append(form_data)
             
         return forms
 
+    def _parse_form(self, form) -> Dict:
+        """Parse a single form and its input fields."""
+        form_data = {
+            'name': form.get('name'),
+            'id': form.get('id'),
+            'method': form.get('method', 'get'),
+            'action': self._resolve(form.get('action', '')),
+            'inputs': []
+        }
+        
+        for input_field in self._form_fields[id(form)]:
+            form_data['inputs'].append({
+                'type': input_field.get('type', 'text'),
+                'name': input_field.get('name'),
+                'id': input_field.get('id'),
+                'required': input_field.get('required') is not None,
+                'placeholder': input_field.get('placeholder'),
+                'label': self.find_input_label(input_field)
+            })
+            
+        return form_data
+
     def find_input_label(self, input_field) -> Optional[str]:
         """Find the label associated with an input field."""
         # Check for aria-label
@@ -437,19 +958,18 @@ class WebpageSemanticParser:
         # Check for associated label tag
         input_id = input_field.get('id')
         if input_id:
-            label = self.soup.find('label', {'for': input_id})
+            label = self._labels_by_for.get(input_id)
             if label:
-                return label.get_text(strip=True)
+                return self._text(label)
                 
         # Check for parent label
-        parent_label = input_field.find_parent('label')
+        parent_label = self._parent_labels.get(id(input_field))
         if parent_label:
             # Remove the input's text from the label
-            label_text = parent_label.get_text(strip=True)
-            input_text = input_field.get_text(strip=True)
+            label_text = self._text(parent_label)
+            input_text = self._text(input_field)
             return label_text.replace(input_text, '').strip()
             
-        logger.debug(f"No label found for input: {input_field.get('name', 'unnamed')}")
         return None
 
     def get_available_actions(self) -> Dict:
@@ -457,7 +977,7 @@ class WebpageSemanticParser:
         logger.info("Collecting available actions")
         actions = {}
         
-        for element, semantics in self.actionable_elements.items():
+        for semantics in self.actionable_elements:
             if semantics.purpose not in actions:
                 actions[semantics.purpose] = []
                 
@@ -474,8 +994,9 @@ class WebpageSemanticParser:
         logger.info("Identifying possible tasks")
         tasks = []
         
+        # Forms and navigation were already parsed by build_semantic_hierarchy
         # Check form submission tasks
-        for form in self.parse_forms():
+        for form in self.semantic_structure['forms']:
             tasks.append({
                 'type': 'form_submission',
                 'name': form.get('name', 'Unknown Form'),
@@ -484,7 +1005,7 @@ class WebpageSemanticParser:
             })
         
         # Check navigation tasks
-        for nav in self.parse_navigation():
+        for nav in self.semantic_structure['navigation']:
             tasks.append({
                 'type': 'navigation',
                 'available_destinations': [item['text'] for item in nav['items']],
@@ -492,34 +1013,41 @@ class WebpageSemanticParser:
             })
         
         # Check search capability
-        if 'search' in self.get_available_actions():
+        if any(semantics.purpose == 'search' for semantics in self.actionable_elements):
             tasks.append({
                 'type': 'search',
                 'requirements': ['query'],
                 'location': 'search form or input field'
             })
         
-        logger.debug(f"Identified {len(tasks)} possible tasks")
+        logger.debug("Identified %s possible tasks", len(tasks))
         return tasks
 
-    def traverse_links(self, url: str, depth: int = 5, visited: Optional[set] = None, max_pages: int = 100) -> Dict:
+    def traverse_links(self, url: str, depth: int = 5, visited: Optional[set] = None, max_pages: int = 100,
+                       concurrency: int = 16) -> Dict:
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
         if visited is None:
+            if not self.use_selenium:
+                # Static pages need no browser, so fetch them concurrently
+                run = uvloop.run if uvloop else asyncio.run
+                return run(self._crawl(url, depth, max_pages, concurrency))
             visited = set()
         
         if len(visited) >= max_pages:
-            logger.warning(f"Reached maximum page limit of {max_pages}")
+            logger.warning("Reached maximum page limit of %s", max_pages)
             return {}
         
         if depth == 0 or url in visited:
             return {}
         
-        logger.info(f"Traversing URL: {url} at depth {depth}")
+        logger.info("Traversing URL: %s at depth %s", url, depth)
         visited.add(url)
         
         try:
-            page_data = self.parse_webpage(url)
+            page = self.parse_index(self._fetch_page_source(url), url)
         except Exception as e:
-            logger.error(f"Failed to parse page {url}: {e}")
+            logger.error("Failed to parse page %s: %s", url, e)
             return {
                 'url': url,
                 'error': str(e),
@@ -528,12 +1056,11 @@ class WebpageSemanticParser:
         
         index_tree = {
             'url': url,
-            'title': page_data['structure'].get('title'),
+            'title': page['title'],
             'links': []
         }
         
-        for link in page_data['all_links']:
-            link_url = link['href']
+        for link_url in page['links']:
             if link_url not in visited and self._should_follow_link(link_url):
                 child_index = self.traverse_links(link_url, depth - 1, visited, max_pages)
                 if child_index:
@@ -541,26 +1068,129 @@ class WebpageSemanticParser:
         
         return index_tree
 
+    async def _crawl(self, url: str, depth: int, max_pages: int, concurrency: int) -> Dict:
+        """Traverse static pages with concurrent fetch workers feeding a pool of parsing processes.
+
+        Children are claimed in the order pages finish parsing, so a page linked from
+        several others is placed under whichever finished first and the tree shape can
+        differ between runs, unlike the depth-first order of the sequential traversal.
+
+        Every request still waits for its domain's rate limit slot, and links are only
+        followed within the start page's domain, so the crawl starts at most one request
+        per request_delay seconds. More workers only help while pages take longer than
+        request_delay to load; pass a smaller request_delay for hosts that allow it.
+        """
+        import aiohttp
+
+        if depth <= 0 or max_pages <= 0:
+            return {}
+        loop = asyncio.get_running_loop()
+        # Links are followed within the start page's domain
+        self.base_url = url
+        self._base_parts = urlsplit(url)
+        # Index entries from earlier crawls, revalidated instead of parsed again
+        store = None
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            store = PageStore(os.path.join(self.cache_dir, 'pages.sqlite'))
+
+        index_tree = {'url': url}
+        visited = {url}
+        # Index nodes waiting to be fetched, with the depth left below them
+        pending = asyncio.Queue()
+        pending.put_nowait((index_tree, depth))
+
+        async def fetch_and_parse(session, pool, page_url: str) -> Dict:
+            stored = store.get(page_url) if store else None
+            headers = {}
+            if stored:
+                # Let the server answer 304 for pages unchanged since the last crawl
+                if stored.etag:
+                    headers['If-None-Match'] = stored.etag
+                if stored.last_modified:
+                    headers['If-Modified-Since'] = stored.last_modified
+            await self._async_respect_rate_limits(page_url)
+            async with session.get(page_url, headers=headers) as response:
+                if response.status == 304 and stored:
+                    return stored.parsed
+                body = await response.read()
+                page_source = await response.text(errors='replace')
+                status = response.status
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+
+            body_digest = hashlib.blake2b(body, digest_size=16).digest()
+            if stored and stored.body_digest == body_digest:
+                # Servers that ignore the validators still resend identical pages
+                page = stored.parsed
+            else:
+                # The worker is free to fetch again while the page is parsed in another process
+                page = await loop.run_in_executor(pool, _index_page, page_source, page_url)
+            if store and status == 200:
+                store.put(page_url, StoredPage(etag, last_modified, body_digest, page))
+            return page
+
+        async def worker(session, pool):
+            while True:
+                node, node_depth = await pending.get()
+                try:
+                    page = await fetch_and_parse(session, pool, node['url'])
+                except Exception as e:
+                    logger.error("Failed to parse page %s: %s", node['url'], e)
+                    node['error'] = str(e)
+                    node['links'] = []
+                else:
+                    node['title'] = page['title']
+                    node['links'] = []
+                    if node_depth > 1:
+                        for link_url in page['links']:
+                            if link_url in visited or not self._should_follow_link(link_url):
+                                continue
+                            if len(visited) >= max_pages:
+                                logger.warning("Reached maximum page limit of %s", max_pages)
+                                break
+                            visited.add(link_url)
+                            child = {'url': link_url}
+                            node['links'].append(child)
+                            pending.put_nowait((child, node_depth - 1))
+                finally:
+                    pending.task_done()
+
+        logger.info("Traversing %s with %s fetch workers", url, concurrency)
+        try:
+            # One connection per worker, and resolved hosts kept longer than aiohttp's 10 s since the crawl mostly stays on one host
+            connector = aiohttp.TCPConnector(limit=concurrency, ttl_dns_cache=CRAWL_DNS_CACHE_SECONDS)
+            async with aiohttp.ClientSession(
+                connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout)
+            ) as session:
+                with ProcessPoolExecutor() as pool:
+                    workers = [asyncio.create_task(worker(session, pool)) for _ in range(concurrency)]
+                    await pending.join()
+                    for task in workers:
+                        task.cancel()
+                    await asyncio.gather(*workers, return_exceptions=True)
+        finally:
+            if store:
+                store.close()
+        return index_tree
+
     def _should_follow_link(self, url: str) -> bool:
         try:
-            parsed = urlparse(url)
-            
-            # Skip non-HTTP(S) protocols
-            if parsed.scheme not in ('http', 'https'):
+            # Skip non-HTTP(S) protocols, resolved links nearly always start with the scheme
+            if not url[:6].lower().startswith(('http:', 'https:')) and urlsplit(url).scheme not in ('http', 'https'):
                 return False
                 
             # Skip certain file types
-            skip_extensions = {'.pdf', '.jpg', '.png', '.gif', '.zip'}
-            if any(url.lower().endswith(ext) for ext in skip_extensions):
+            if _SKIP_EXTENSION_RE.search(url):
                 return False
                 
             # Optional: Stay within same domain
-            if parsed.netloc != urlparse(self.base_url).netloc:
+            if urlsplit(url).netloc != self._base_parts.netloc:
                 return False
                 
             return True
         except Exception as e:
-            logger.error(f"Error checking URL {url}: {e}")
+            logger.error("Error checking URL %s: %s", url, e)
             return False
 
     def __enter__(self):
@@ -571,11 +1201,14 @@ class WebpageSemanticParser:
 
     def cleanup(self):
         """Cleanup resources properly"""
+        if self._http_session is not None:
+            self._http_session.close()
+            self._http_session = None
         if self.driver:
             try:
                 self.driver.quit()
             except Exception as e:
-                logger.error(f"Error closing driver: {e}")
+                logger.error("Error closing driver: %s", e)
             finally:
                 self.driver = None
 
@@ -595,11 +1228,16 @@ class WebpageSemanticParser:
             }
         return self.stats
 
+def _index_page(page_source: str, url: str) -> Dict:
+    """Parse a fetched page for the traversal index, in a worker process of the crawler."""
+    return WebpageSemanticParser(use_selenium=False, cache_dir=None).parse_index(page_source, url)
+
 # Example usage
-def analyze_webpage(url: str) -> Dict:
-    logger.info(f"Starting webpage analysis for: {url}")
-    parser = WebpageSemanticParser(use_selenium=True)
-    understanding = parser.parse_webpage(url)
+def analyze_webpage(url: str, parser: Optional[WebpageSemanticParser] = None) -> Dict:
+    logger.info("Starting webpage analysis for: %s", url)
+    # A parser created here is closed again, one passed in stays open for the caller
+    with WebpageSemanticParser(use_selenium=True) if parser is None else nullcontext(parser) as parser:
+        understanding = parser.parse_webpage(url)
     
     logger.info("Analysis complete")
     logger.debug("Available actions: %s", understanding['actions'])
@@ -608,28 +1246,81 @@ def analyze_webpage(url: str) -> Dict:
     
     return understanding
 
-def analyze_webpage_with_traversal(url: str) -> Dict:
-    logger.info(f"Starting webpage analysis with traversal for: {url}")
-    parser = WebpageSemanticParser(use_selenium=True)
-    index_tree = parser.traverse_links(url)
+def analyze_webpage_with_traversal(url: str, parser: Optional[WebpageSemanticParser] = None) -> Dict:
+    logger.info("Starting webpage analysis with traversal for: %s", url)
+    with WebpageSemanticParser(use_selenium=True) if parser is None else nullcontext(parser) as parser:
+        index_tree = parser.traverse_links(url)
     
     logger.info("Traversal and analysis complete")
     return index_tree
 
+def analyze_webpages(urls: List[str], max_workers: int = 4, use_selenium: bool = True,
+                     cache_dir: Optional[str] = '.wsp_cache') -> Dict[str, Dict]:
+    """Analyze several pages concurrently, reusing one browser session per worker."""
+    if max_workers < 1:
+        raise ValueError(f"max_workers must be at least 1, got {max_workers}")
+    logger.info("Starting analysis of %s webpages with %s workers", len(urls), max_workers)
+    idle_parsers = queue.Queue()
+    workers = []
+
+    def analyze(url: str) -> Dict:
+        parser = idle_parsers.get()
+        try:
+            return parser.parse_webpage(url)
+        except Exception as e:
+            logger.error("Failed to parse page %s: %s", url, e)
+            return {'url': url, 'error': str(e)}
+        finally:
+            idle_parsers.put(parser)
+
+    try:
+        # Workers are started inside the try, so a failed start closes only those already running
+        for i in range(min(max_workers, len(urls))):
+            # Running Chrome instances cannot share a disk cache, so each worker gets its own
+            workers.append(WebpageSemanticParser(
+                use_selenium=use_selenium,
+                cache_dir=os.path.join(cache_dir, f'worker-{i}') if cache_dir else None
+            ))
+        for worker in workers:
+            # Rate limits apply per domain across all workers
+            worker.last_request_time = workers[0].last_request_time
+            worker._rate_lock = workers[0]._rate_lock
+            idle_parsers.put(worker)
+
+        with ThreadPoolExecutor(max_workers=max(len(workers), 1)) as executor:
+            return dict(zip(urls, executor.map(analyze, urls)))
+    finally:
+        for worker in workers:
+            worker.cleanup()
+
+def _write_json(path: str, data, default=None):
+    """Write data to path as JSON indented by two spaces, with orjson when it can encode it."""
+    import orjson
+
+    try:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2, default=default)
+    except orjson.JSONEncodeError:
+        # orjson rejects integers beyond 64 bits, which JSON-LD blocks can carry
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2, default=default)
+        return
+    # Unlike json, orjson writes NaN and Infinity as null, keeping the file valid JSON
+    with open(path, 'wb') as f:
+        f.write(payload)
+
 def main():
     URL = "https://read.readwise.io/"
     logger.info("Starting main function")
-    parser = WebpageSemanticParser()
-    understanding = parser.parse_webpage(URL)
-    with open('understanding.json', 'w') as f:
-        json.dump(understanding, f, indent=2, default=lambda o: o.to_dict() if hasattr(o, 'to_dict') else str(o))
-    logger.info("Main function completed")
-
-    logger.info("Starting main function with traversal")
-    index_tree = analyze_webpage_with_traversal(URL)
-    with open('index_tree.json', 'w') as f:
-        json.dump(index_tree, f, indent=2)
-    logger.info("Main function with traversal completed")
+    # One browser session serves both the single-page analysis and the traversal
+    with WebpageSemanticParser() as parser:
+        understanding = parser.parse_webpage(URL)
+        _write_json('understanding.json', understanding, default=str)
+        logger.info("Main function completed")
+
+        logger.info("Starting main function with traversal")
+        index_tree = analyze_webpage_with_traversal(URL, parser)
+        _write_json('index_tree.json', index_tree)
+        logger.info("Main function with traversal completed")
 
 # To use the parser:
 if __name__ == "__main__":